@@ -1,10 +1,17 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, 
                              QPushButton, QLabel, QGroupBox, QRadioButton,
-                             QFrame)
+                             QFrame, QLineEdit)
 from PyQt6.QtCore import Qt, QRect, QPoint, QRectF, QSize
 from PyQt6.QtGui import QFont, QPainter, QPen, QColor, QBrush, QPainterPath, QPixmap
 import os
 
+from src.core.commands import GATE_COMMANDS
+from src.core.logic_minimizer import (GATE_AND, GATE_INVERTER, GATE_OR, QM_MAX_VARIABLES,
+                                      minimize_input)
+
+# Minimization runs on the GUI thread, so stay within the fast exact range
+EXPRESSION_MAX_VARIABLES = QM_MAX_VARIABLES
+
 class LogicGateWidget(QFrame):
     def __init__(self, gate_type, parent=None):
         super().__init__(parent)
@@ -73,9 +80,10 @@ class LogicGateWidget(QFrame):
             self.parent().select_or_gate()
 
 class LogicControllerWindow(QWidget):
-    def __init__(self, usb_device, parent=None):
+    def __init__(self, pic_controller, parent=None):
         super().__init__(parent)
-        self.usb_device = usb_device
+        self.pic_controller = pic_controller
+        self.usb_device = pic_controller.usb_device
         self._init_ui()
 
     def _init_ui(self):
@@ -105,6 +113,27 @@ class LogicControllerWindow(QWidget):
 
         layout.addLayout(gates_layout)
 
+        # Expression entry, minimized before anything is sent to the PIC
+        expression_layout = QHBoxLayout()
+        expression_label = QLabel("Expression / Truth Table:")
+        expression_label.setFont(QFont("Arial", 10))
+        self.expression_edit = QLineEdit()
+        self.expression_edit.setFont(QFont("Arial", 10))
+        self.expression_edit.setPlaceholderText("e.g. A & B | A & ~B, or a truth table such as 0001")
+        self.expression_edit.returnPressed.connect(self.apply_expression)
+        self.minimize_button = QPushButton("Minimize")
+        self.minimize_button.setFont(QFont("Arial", 10))
+        self.minimize_button.clicked.connect(self.apply_expression)
+        expression_layout.addWidget(expression_label)
+        expression_layout.addWidget(self.expression_edit)
+        expression_layout.addWidget(self.minimize_button)
+        layout.addLayout(expression_layout)
+
+        self.result_label = QLabel("")
+        self.result_label.setFont(QFont("Arial", 10))
+        self.result_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        layout.addWidget(self.result_label)
+
         # Status label
         self.status_label = QLabel("Status: Ready")
         self.status_label.setFont(QFont("Arial", 10))
@@ -120,23 +149,64 @@ class LogicControllerWindow(QWidget):
         self.or_gate.selected = False
         self.and_gate.update()
         self.or_gate.update()
-        self._send_gate_command('A')
+        self._send_gate_command('AND')
 
     def select_or_gate(self):
         self.and_gate.selected = False
         self.or_gate.selected = True
         self.and_gate.update()
         self.or_gate.update()
-        self._send_gate_command('O')
+        self._send_gate_command('OR')
+
+    def apply_expression(self):
+        text = self.expression_edit.text().strip()
+        if not text:
+            return
+        try:
+            result = minimize_input(text, EXPRESSION_MAX_VARIABLES)
+        except ValueError as e:
+            self.result_label.setText(f"Invalid expression: {e}")
+            self.result_label.setStyleSheet("color: #FF0000;")
+            self.status_label.setText("Status: Ready")
+            self.status_label.setStyleSheet("color: #666666;")
+            return
 
-    def _send_gate_command(self, command):
+        gates = result.to_gates()
+        self.result_label.setText(f"Minimized: {result.to_expression()} ({len(gates)} gates)")
+        self.result_label.setStyleSheet("color: #666666;")
+
+        # The device currently implements a single two-input AND or OR gate
+        two_input = len(gates) == 1 and len(gates[0]['inputs']) == 2
+        if two_input and gates[0]['type'] == GATE_AND:
+            self.select_and_gate()
+        elif two_input and gates[0]['type'] == GATE_OR:
+            self.select_or_gate()
+        elif not gates:
+            self.status_label.setText("Status: Expression is a constant or single input, no gate needed")
+            self.status_label.setStyleSheet("color: #666666;")
+        elif len(gates) == 1 and gates[0]['type'] == GATE_INVERTER:
+            self.status_label.setText("Status: Device has no inverter gate")
+            self.status_label.setStyleSheet("color: #FF0000;")
+        elif len(gates) == 1:
+            self.status_label.setText(f"Status: Device gates take 2 inputs, expression needs "
+                                      f"{len(gates[0]['inputs'])}")
+            self.status_label.setStyleSheet("color: #FF0000;")
+        else:
+            self.status_label.setText("Status: Expression needs more than one gate")
+            self.status_label.setStyleSheet("color: #FF0000;")
+
+    def _send_gate_command(self, gate_type):
         if not self.usb_device.is_connected():
             self.status_label.setText("Status: Not connected to device")
             self.status_label.setStyleSheet("color: #FF0000;")
             return
+        if self.pic_controller.transfer_active:
+            self.status_label.setText("Status: Transfer in progress, try again when it finishes")
+            self.status_label.setStyleSheet("color: #FF0000;")
+            return
 
-        if self.usb_device.send_data(command.encode()):
-            self.status_label.setText(f"Status: Sending {command} command...")
+        if self.pic_controller.send_command(GATE_COMMANDS[gate_type].name):
+            self.status_label.setText(f"Status: Sending {gate_type} command...")
             self.status_label.setStyleSheet("color: #666666;")
         else:
             self.status_label.setText("Status: Failed to send command")
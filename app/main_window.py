@@ -1,13 +1,16 @@
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout,
                              QHBoxLayout, QPushButton, QLabel, QComboBox,
                              QMenuBar, QMenu, QStatusBar, QMdiArea, QMdiSubWindow,
-                             QFrame, QGroupBox, QGridLayout)
+                             QFrame, QGroupBox, QGridLayout, QFileDialog)
 from PyQt6.QtCore import QTimer, Qt
 from PyQt6.QtGui import QPalette, QColor, QAction, QFont
+import os
 
 from .usb_device import USBDevice
 from .pic_controller import PICController
 from .logic_controller import LogicControllerWindow
+from .transfer_window import TransferWindow
+from src.core.commands import TARGET_CONFIGURATION, TARGET_FIRMWARE
 
 class StatusLED(QFrame):
     def __init__(self, parent=None):
@@ -44,6 +47,13 @@ class MainWindow(QMainWindow):
         
         # File Menu
         file_menu = menubar.addMenu('File')
+        upload_config_action = QAction('Upload Configuration...', self)
+        upload_config_action.triggered.connect(lambda: self.show_transfer(TARGET_CONFIGURATION))
+        file_menu.addAction(upload_config_action)
+        upload_firmware_action = QAction('Upload Firmware...', self)
+        upload_firmware_action.triggered.connect(lambda: self.show_transfer(TARGET_FIRMWARE))
+        file_menu.addAction(upload_firmware_action)
+        file_menu.addSeparator()
         exit_action = QAction('Exit', self)
         exit_action.triggered.connect(self.close)
         file_menu.addAction(exit_action)
@@ -167,6 +177,8 @@ class MainWindow(QMainWindow):
             self.port_combo.addItem(display_text, port['device'])
 
     def toggle_connection(self):
+        if self.pic_controller.transfer_active:
+            return
         if self.usb_device.is_connected():
             self.usb_device.disconnect()
             self.connect_button.setText("Connect")
@@ -187,6 +199,8 @@ class MainWindow(QMainWindow):
                 self.usb_device.read_data(1)  # Clear buffer
 
     def test_communication(self):
+        if self.pic_controller.transfer_active:
+            return
         result = self.pic_controller.toggle_led()
         if result:
             self.result_label.setText("Status: ✅ Communication Successful")
@@ -203,6 +217,9 @@ class MainWindow(QMainWindow):
             self.status_label.setText("Not Connected")
 
     def closeEvent(self, event):
+        # Sub-windows stop their own work first, a running transfer included
+        self.mdi_area.closeAllSubWindows()
+
         # Clean up resources before closing
         if self.usb_device.is_connected():
             self.usb_device.disconnect()
@@ -223,7 +240,7 @@ class MainWindow(QMainWindow):
 
         # Create new logic controller window
         sub_window = QMdiSubWindow()
-        logic_controller_widget = LogicControllerWindow(self.usb_device)
+        logic_controller_widget = LogicControllerWindow(self.pic_controller)
         sub_window.setWidget(logic_controller_widget)
         sub_window.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
         
@@ -236,7 +253,69 @@ class MainWindow(QMainWindow):
         # Store reference to the window
         self.mdi_windows['logic_controller'] = sub_window
 
-    def _cleanup_window(self, window_key):
+    def show_transfer(self, target):
+        if not self.usb_device.is_connected():
+            self.statusBar.showMessage("Connect to a device before uploading", 5000)
+            return
+
+        # Only one transfer can use the serial link at a time; a finished
+        # one is replaced by the new upload
+        old_window = self.mdi_windows.get('transfer')
+        if old_window is not None:
+            try:
+                if old_window.widget().is_running():
+                    old_window.showNormal()
+                    old_window.widget().raise_()
+                    self.statusBar.showMessage("A transfer is already running", 5000)
+                    return
+            except RuntimeError:
+                del self.mdi_windows['transfer']
+                old_window = None
+
+        file_name, _ = QFileDialog.getOpenFileName(self, "Select File to Upload")
+        if not file_name:
+            return
+        try:
+            with open(file_name, 'rb') as f:
+                data = f.read()
+        except OSError as e:
+            self.statusBar.showMessage(f"Could not read {file_name}: {e}", 5000)
+            return
+
+        try:
+            transfer_widget = TransferWindow(self.pic_controller, data, target, os.path.basename(file_name))
+        except ValueError as e:
+            self.statusBar.showMessage(f"Cannot upload {file_name}: {e}", 5000)
+            return
+
+        if old_window is not None:
+            old_window.close()
+
+        sub_window = QMdiSubWindow()
+        transfer_widget.transfer_active_changed.connect(self._set_transfer_active)
+        sub_window.setWidget(transfer_widget)
+        sub_window.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+        sub_window.destroyed.connect(lambda: self._cleanup_window('transfer', sub_window))
+
+        self.mdi_area.addSubWindow(sub_window)
+        sub_window.show()
+        self.mdi_windows['transfer'] = sub_window
+        transfer_widget.start()
+
+    def _set_transfer_active(self, active):
+        # The serial link belongs to the transfer until it completes
+        connected = bool(self.usb_device.is_connected())
+        self.connect_button.setEnabled(not active)
+        self.test_button.setEnabled(connected and not active)
+        if active:
+            self.statusBar.showMessage("Transfer in progress")
+        else:
+            self.statusBar.showMessage("Ready")
+
+    def _cleanup_window(self, window_key, window=None):
         """Remove the reference to a destroyed window"""
+        # A replaced window must not remove the entry of its successor
+        if window is not None and self.mdi_windows.get(window_key) is not window:
+            return
         if window_key in self.mdi_windows:
             del self.mdi_windows[window_key] 
\ No newline at end of file
@@ -0,0 +1,121 @@
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
+                             QLabel, QProgressBar)
+from PyQt6.QtCore import Qt, QThread, QElapsedTimer, pyqtSignal
+from PyQt6.QtGui import QFont
+
+from .pic_controller import PICController
+from src.core.block_transfer import BlockTransfer
+
+class TransferWorker(QThread):
+    progress = pyqtSignal(int, int)
+    completed = pyqtSignal(bool)
+
+    def __init__(self, pic_controller: PICController, transfer: BlockTransfer, parent=None):
+        super().__init__(parent)
+        self.pic_controller = pic_controller
+        self.transfer = transfer
+        self.resume = False
+
+    def cancel(self):
+        self.transfer.cancel()
+
+    def run(self):
+        result = self.pic_controller.run_bulk(self.transfer, self.progress.emit, self.resume)
+        self.completed.emit(result)
+
+class TransferWindow(QWidget):
+    # Emitted when the transfer starts or stops owning the serial link
+    transfer_active_changed = pyqtSignal(bool)
+
+    def __init__(self, pic_controller: PICController, data: bytes, target: int, name: str, parent=None):
+        super().__init__(parent)
+        self.pic_controller = pic_controller
+        self.name = name
+        self.elapsed = QElapsedTimer()
+        self.start_bytes = None
+        self.worker = TransferWorker(pic_controller, pic_controller.create_bulk(data, target), self)
+        self.worker.progress.connect(self.update_progress)
+        self.worker.completed.connect(self.transfer_finished)
+        self._init_ui()
+
+    def _init_ui(self):
+        self.setWindowTitle("Block Transfer")
+        layout = QVBoxLayout(self)
+        layout.setSpacing(10)
+        layout.setContentsMargins(20, 20, 20, 20)
+
+        title_label = QLabel(f"Sending {self.name}")
+        title_label.setFont(QFont("Arial", 12, QFont.Weight.Bold))
+        title_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        layout.addWidget(title_label)
+
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, max(len(self.worker.transfer.data), 1))
+        self.progress_bar.setValue(0)
+        layout.addWidget(self.progress_bar)
+
+        self.status_label = QLabel("Status: Starting...")
+        self.status_label.setFont(QFont("Arial", 10))
+        self.status_label.setStyleSheet("color: #666666;")
+        self.status_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        layout.addWidget(self.status_label)
+
+        button_layout = QHBoxLayout()
+        self.resume_button = QPushButton("Resume")
+        self.resume_button.setFont(QFont("Arial", 10))
+        self.resume_button.setEnabled(False)
+        self.resume_button.clicked.connect(self.resume)
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.setFont(QFont("Arial", 10))
+        self.cancel_button.clicked.connect(self.worker.cancel)
+        button_layout.addWidget(self.resume_button)
+        button_layout.addWidget(self.cancel_button)
+        layout.addLayout(button_layout)
+
+        layout.addStretch()
+
+    def start(self):
+        self.start_bytes = None
+        self.elapsed.start()
+        # Claim the link before the thread runs so nothing slips in between
+        self.pic_controller.transfer_active = True
+        self.transfer_active_changed.emit(True)
+        self.worker.start()
+
+    def is_running(self):
+        return self.worker.isRunning()
+
+    def resume(self):
+        self.resume_button.setEnabled(False)
+        self.cancel_button.setEnabled(True)
+        self.status_label.setText("Status: Resuming...")
+        self.status_label.setStyleSheet("color: #666666;")
+        self.worker.resume = True
+        self.start()
+
+    def update_progress(self, sent, total):
+        self.progress_bar.setValue(sent)
+        if self.start_bytes is None:
+            self.start_bytes = sent
+        seconds = self.elapsed.elapsed() / 1000
+        rate = (sent - self.start_bytes) / seconds if seconds > 0 else 0
+        self.status_label.setText(f"Status: {sent} / {total} bytes ({rate:.0f} B/s)")
+
+    def transfer_finished(self, success):
+        self.transfer_active_changed.emit(False)
+        self.cancel_button.setEnabled(False)
+        if success:
+            self.status_label.setText("Status: ✅ Transfer complete")
+            self.status_label.setStyleSheet("color: #008000;")
+        else:
+            self.status_label.setText("Status: ❌ Transfer interrupted")
+            self.status_label.setStyleSheet("color: #FF0000;")
+            self.resume_button.setEnabled(self.pic_controller.last_transfer is not None)
+
+    def closeEvent(self, event):
+        # Stop the worker before the window goes away
+        if self.worker.isRunning():
+            self.worker.cancel()
+            self.worker.wait()
+        self.transfer_active_changed.emit(False)
+        event.accept()
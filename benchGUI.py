@@ -0,0 +1,271 @@
+import argparse
+import gc
+import json
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+
+# Must be set before Qt is imported
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+ITERATIONS = 200
+OPEN_CLOSE_CYCLES = 50
+
+# Timings recorded offscreen on Linux with Python 3.11 and PyQt6 6.6
+BASELINE = {
+    'import_main_window_ms': 65.0,
+    'first_show_ms': 60.0,
+    'paint_ms_per_widget': 0.14,
+    'resize_ms_per_widget': 0.40,
+}
+# A timing may be this many times its baseline before the run fails
+TIMING_FACTOR = 3.0
+
+# Upper limits; a result above its threshold fails the run. A leaked Logic
+# Controller costs about 200 KB of RSS and 6 KB of Python heap per cycle,
+# while a clean cycle stays around 3 KB and 0.2 KB.
+THRESHOLDS = {name: round(value * TIMING_FACTOR, 2) for name, value in BASELINE.items()}
+THRESHOLDS.update({
+    'memory_growth_kb_per_cycle': 1.0,
+    'rss_growth_kb_per_cycle': 25.0,
+    'leaked_mdi_windows': 0,
+    'leaked_sub_windows': 0,
+    'leaked_logic_controllers': 0,
+})
+
+class MockUSBDevice:
+    """Stands in for USBDevice so no real serial ports are touched"""
+
+    def __init__(self):
+        self.connected = False
+        self.port_name = ""
+        self.baud_rate = 9600
+
+    def list_available_ports(self):
+        return [{'device': f'COM{i}', 'description': 'Mock Port', 'manufacturer': 'Mock'}
+                for i in range(1, 5)]
+
+    def connect(self, port_name, baud_rate=9600):
+        self.connected = True
+        self.port_name = port_name
+        return True
+
+    def disconnect(self):
+        self.connected = False
+        self.port_name = ""
+
+    def send_data(self, data):
+        return self.connected
+
+    def read_data(self, size=1):
+        return b'O' * size if self.connected else None
+
+    def clear_input(self):
+        pass
+
+    def is_connected(self):
+        return self.connected
+
+def measure_import_time():
+    # Run in a fresh interpreter so nothing is already cached in sys.modules
+    code = ("import time; start = time.perf_counter(); import app.main_window; "
+            "print((time.perf_counter() - start) * 1000)")
+    output = subprocess.check_output([sys.executable, '-c', code], cwd=ROOT)
+    return float(output.decode().strip().splitlines()[-1])
+
+def _windows_rss_kb():
+    import ctypes
+    from ctypes import wintypes
+
+    class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+        _fields_ = [('cb', wintypes.DWORD),
+                    ('PageFaultCount', wintypes.DWORD),
+                    ('PeakWorkingSetSize', ctypes.c_size_t),
+                    ('WorkingSetSize', ctypes.c_size_t),
+                    ('QuotaPeakPagedPoolUsage', ctypes.c_size_t),
+                    ('QuotaPagedPoolUsage', ctypes.c_size_t),
+                    ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t),
+                    ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+                    ('PagefileUsage', ctypes.c_size_t),
+                    ('PeakPagefileUsage', ctypes.c_size_t)]
+
+    kernel32 = ctypes.WinDLL('kernel32')
+    psapi = ctypes.WinDLL('psapi')
+    kernel32.GetCurrentProcess.restype = wintypes.HANDLE
+    psapi.GetProcessMemoryInfo.argtypes = [wintypes.HANDLE, ctypes.POINTER(PROCESS_MEMORY_COUNTERS),
+                                           wintypes.DWORD]
+    counters = PROCESS_MEMORY_COUNTERS()
+    counters.cb = ctypes.sizeof(counters)
+    if not psapi.GetProcessMemoryInfo(kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb):
+        return None
+    return counters.WorkingSetSize / 1024
+
+def current_rss_kb():
+    """Resident set size of this process, which includes Qt's C++ heap.
+
+    Returns (kilobytes, kind) where kind is 'current', or 'peak' where the
+    platform only reports the high-water mark, or (None, 'unavailable').
+    """
+    if sys.platform == 'win32':
+        try:
+            rss = _windows_rss_kb()
+        except (OSError, AttributeError):
+            rss = None
+        return (rss, 'current') if rss is not None else (None, 'unavailable')
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1024, 'current'
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None, 'unavailable'
+    # macOS and other Unixes only report the peak, in bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return (peak / 1024 if sys.platform == 'darwin' else peak), 'peak'
+
+def count_live(widget_class):
+    from PyQt6.QtWidgets import QApplication
+    return sum(1 for widget in QApplication.allWidgets() if isinstance(widget, widget_class))
+
+def process_deferred_deletes(app):
+    from PyQt6.QtCore import QCoreApplication, QEvent
+    app.processEvents()
+    QCoreApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete.value)
+    app.processEvents()
+
+def measure_first_show(app, main_window_module):
+    start = time.perf_counter()
+    window = main_window_module.MainWindow()
+    window.show()
+    while not (window.windowHandle() and window.windowHandle().isExposed()):
+        app.processEvents()
+        if time.perf_counter() - start > 10:
+            break
+    app.processEvents()
+    return window, (time.perf_counter() - start) * 1000
+
+def measure_gate_widgets(app, iterations):
+    from app.logic_controller import LogicGateWidget
+
+    paint_times = []
+    resize_times = []
+    for gate_type in ('AND', 'OR'):
+        widget = LogicGateWidget(gate_type)
+        widget.resize(300, 200)
+        widget.show()
+        app.processEvents()
+
+        start = time.perf_counter()
+        for _ in range(iterations):
+            widget.repaint()
+        paint_times.append((time.perf_counter() - start) * 1000 / iterations)
+
+        sizes = ((300, 200), (400, 260))
+        start = time.perf_counter()
+        for i in range(iterations):
+            widget.resize(*sizes[i % 2])
+        resize_times.append((time.perf_counter() - start) * 1000 / iterations)
+
+        widget.close()
+        widget.deleteLater()
+        process_deferred_deletes(app)
+    return max(paint_times), max(resize_times)
+
+def measure_open_close(app, window, cycles):
+    from app.logic_controller import LogicControllerWindow
+
+    def cycle():
+        window.show_logic_controller()
+        app.processEvents()
+        sub_window = window.mdi_windows.get('logic_controller')
+        if sub_window is not None:
+            sub_window.close()
+        process_deferred_deletes(app)
+
+    # Warm up caches (pixmaps, fonts, style sheets) before measuring
+    for _ in range(3):
+        cycle()
+    gc.collect()
+
+    tracemalloc.start()
+    heap_baseline = tracemalloc.get_traced_memory()[0]
+    rss_baseline, rss_kind = current_rss_kb()
+    for _ in range(cycles):
+        cycle()
+    gc.collect()
+    heap_growth = tracemalloc.get_traced_memory()[0] - heap_baseline
+    rss_end, _ = current_rss_kb()
+    tracemalloc.stop()
+
+    results = {
+        'memory_growth_kb_per_cycle': heap_growth / 1024 / cycles,
+        'leaked_mdi_windows': len(window.mdi_windows),
+        'leaked_sub_windows': len(window.mdi_area.subWindowList()),
+        'leaked_logic_controllers': count_live(LogicControllerWindow),
+    }
+    # Growth of the peak only shows new high-water marks, so it is reported
+    # under its own name and not held to the current-RSS threshold
+    if rss_kind == 'current':
+        results['rss_growth_kb_per_cycle'] = (rss_end - rss_baseline) / cycles
+    elif rss_kind == 'peak':
+        results['peak_rss_growth_kb_per_cycle'] = (rss_end - rss_baseline) / cycles
+    return results, rss_kind
+
+def main():
+    parser = argparse.ArgumentParser(description="Offscreen GUI performance benchmarks")
+    parser.add_argument('--output', help="Write JSON results to this file")
+    parser.add_argument('--thresholds', help="JSON file overriding the default thresholds")
+    parser.add_argument('--iterations', type=int, default=ITERATIONS)
+    parser.add_argument('--cycles', type=int, default=OPEN_CLOSE_CYCLES)
+    args = parser.parse_args()
+
+    os.chdir(ROOT)  # Gate images are loaded relative to the repository root
+    thresholds = dict(THRESHOLDS)
+    if args.thresholds:
+        with open(args.thresholds) as f:
+            thresholds.update(json.load(f))
+
+    results = {'import_main_window_ms': measure_import_time()}
+
+    from PyQt6.QtWidgets import QApplication
+    import app.main_window as main_window_module
+    main_window_module.USBDevice = MockUSBDevice
+
+    app = QApplication(sys.argv[:1])
+    window, results['first_show_ms'] = measure_first_show(app, main_window_module)
+    results['paint_ms_per_widget'], results['resize_ms_per_widget'] = \
+        measure_gate_widgets(app, args.iterations)
+    open_close, rss_kind = measure_open_close(app, window, args.cycles)
+    results.update(open_close)
+    window.close()
+
+    failures = [name for name, limit in thresholds.items()
+                if name in results and results[name] > limit]
+    skipped = [name for name in thresholds if name not in results]
+    report = {
+        'platform': os.environ['QT_QPA_PLATFORM'],
+        'rss_measure': rss_kind,
+        'iterations': args.iterations,
+        'cycles': args.cycles,
+        'results': results,
+        'baseline': BASELINE,
+        'thresholds': thresholds,
+        'failures': failures,
+        'skipped': skipped,
+        'passed': not failures,
+    }
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    print(text)
+    sys.exit(1 if failures else 0)
+
+if __name__ == '__main__':
+    main()
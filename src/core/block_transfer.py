@@ -0,0 +1,149 @@
+import binascii
+from typing import Callable, Optional
+
+from .commands import COMMANDS, TARGET_CONFIGURATION, TRANSFER_ACK, TRANSFER_NAK
+from .usb_device import USBDevice
+
+DEFAULT_BLOCK_SIZE = 256
+DEFAULT_WINDOW = 8
+MAX_RETRIES = 5
+
+def block_checksum(data: bytes) -> int:
+    """CRC-16/CCITT, cheap to compute on the PIC side"""
+    return binascii.crc_hqx(data, 0xFFFF)
+
+class BlockTransfer:
+    """Go-back-N sliding window transfer of a byte buffer to the PIC.
+
+    Up to `window` blocks are in flight at once; the device answers each
+    block with a cumulative ACK or a NAK carrying the next sequence it
+    expects. On NAK or timeout the sender rewinds to the first unconfirmed
+    block. A failed or cancelled transfer keeps `next_block` so resume()
+    can pick up where the device left off.
+    """
+
+    def __init__(self, usb_device: USBDevice, data: bytes, target: int = TARGET_CONFIGURATION,
+                 block_size: int = DEFAULT_BLOCK_SIZE, window: int = DEFAULT_WINDOW,
+                 max_retries: int = MAX_RETRIES):
+        if not 0 < block_size <= 0xFFFF:
+            raise ValueError(f"Invalid block size: {block_size}")
+        if not 0 < window <= 0xFF:
+            raise ValueError(f"Invalid window size: {window}")
+        self.usb_device = usb_device
+        self.data = bytes(data)
+        self.target = target
+        self.block_size = block_size
+        self.window = window
+        self.max_retries = max_retries
+        self.block_count = (len(self.data) + block_size - 1) // block_size
+        if self.block_count > 0xFFFF:
+            raise ValueError("Data too large for 16-bit block sequence numbers")
+        self.next_block = 0
+        self.cancelled = False
+
+        # Frames are built once so retransmissions cost only the write
+        header = COMMANDS['TRANSFER_BLOCK']
+        self._frames = []
+        for seq in range(self.block_count):
+            payload = self.data[seq * block_size:(seq + 1) * block_size]
+            self._frames.append(header.encode(sequence=seq, length=len(payload),
+                                              checksum=block_checksum(payload)) + payload)
+
+    @property
+    def bytes_confirmed(self) -> int:
+        return min(self.next_block * self.block_size, len(self.data))
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+    def _read_reply(self, command) -> Optional[tuple]:
+        data = self.usb_device.read_data(command.reply_size)
+        reply = command.decode_reply(data)
+        if reply is None and data:
+            # A partial reply would leave every later one misaligned
+            self.usb_device.clear_input()
+        return reply
+
+    def _request(self, name: str, **kwargs) -> Optional[tuple]:
+        command = COMMANDS[name]
+        if not self.usb_device.send_data(command.encode(**kwargs)):
+            return None
+        return self._read_reply(command)
+
+    def resume(self, progress: Optional[Callable[[int, int], None]] = None) -> bool:
+        self.cancelled = False
+        return self.run(progress)
+
+    def run(self, progress: Optional[Callable[[int, int], None]] = None) -> bool:
+        if self.cancelled or not self.usb_device.is_connected():
+            return False
+
+        # Drop anything left over from an earlier, interrupted exchange
+        self.usb_device.clear_input()
+
+        reply = self._request('TRANSFER_BEGIN', target=self.target, total_size=len(self.data),
+                              block_size=self.block_size, window=self.window,
+                              checksum=block_checksum(self.data))
+        if reply is None or reply[0] != TRANSFER_ACK:
+            return False
+        # The device reports how many blocks it already holds, which lets an
+        # interrupted transfer pick up from there
+        if reply[1] <= self.block_count:
+            self.next_block = reply[1]
+        if progress:
+            progress(self.bytes_confirmed, len(self.data))
+
+        block_reply = COMMANDS['TRANSFER_BLOCK']
+        base = self.next_block
+        next_seq = base
+        rewound_to = None
+        retries = 0
+        while base < self.block_count:
+            if self.cancelled:
+                return False
+
+            # Fill the window with a single write
+            end = min(base + self.window, self.block_count)
+            if next_seq < end:
+                if not self.usb_device.send_data(b''.join(self._frames[next_seq:end])):
+                    return False
+                next_seq = end
+
+            reply = self._read_reply(block_reply)
+            if reply is None:
+                # Timeout or partial reply, resend everything after the last
+                # confirmed block
+                retries += 1
+                if retries > self.max_retries:
+                    return False
+                next_seq = base
+                rewound_to = base
+                continue
+
+            status, seq = reply
+            if seq == self.block_count and status in (TRANSFER_ACK, TRANSFER_NAK):
+                # The device holds every block. This also covers a lost final
+                # ACK, after which the resent last block is NAKed as unexpected
+                base = seq
+                self.next_block = base
+                if progress:
+                    progress(self.bytes_confirmed, len(self.data))
+            elif status == TRANSFER_ACK and base < seq <= next_seq:
+                base = seq
+                self.next_block = base
+                retries = 0
+                if progress:
+                    progress(self.bytes_confirmed, len(self.data))
+            elif status == TRANSFER_NAK and seq != rewound_to and base <= seq < self.block_count:
+                # Blocks still in flight behind a NAK produce more NAKs for
+                # the same sequence, rewind only once for them
+                retries += 1
+                if retries > self.max_retries:
+                    return False
+                base = seq
+                self.next_block = base
+                next_seq = base
+                rewound_to = base
+
+        reply = self._request('TRANSFER_END')
+        return reply is not None and reply[0] == TRANSFER_ACK
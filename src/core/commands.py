@@ -0,0 +1,148 @@
+import struct
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+# All multi-byte fields are sent little-endian with no padding
+BYTE_ORDER = '<'
+
+# Every opcode understood by the PIC firmware lives here and nowhere else.
+# Columns: name, opcode, argument format, argument names, reply format, expected reply
+COMMAND_TABLE = (
+    ('TOGGLE_LED', 0xA1, '', (), 'c', b'O'),
+    ('GATE_AND', ord('A'), '', (), None, None),
+    ('GATE_OR', ord('O'), '', (), None, None),
+    # Bulk transfers, see block_transfer.py. Each TRANSFER_BLOCK header is
+    # followed by `length` payload bytes; replies are TRANSFER_ACK or
+    # TRANSFER_NAK plus the next block sequence the device expects.
+    ('TRANSFER_BEGIN', 0xB0, 'BIHBH', ('target', 'total_size', 'block_size', 'window', 'checksum'), 'cH', None),
+    ('TRANSFER_BLOCK', 0xB1, 'HHH', ('sequence', 'length', 'checksum'), 'cH', None),
+    ('TRANSFER_END', 0xB2, '', (), 'cH', None),
+)
+
+TRANSFER_ACK = b'K'
+TRANSFER_NAK = b'N'
+
+# Values for the TRANSFER_BEGIN target field
+TARGET_CONFIGURATION = 0
+TARGET_FIRMWARE = 1
+
+class Command:
+    def __init__(self, name: str, opcode: int, arg_format: str, arg_names: Tuple[str, ...],
+                 reply_format: Optional[str], expected_reply: Optional[bytes]):
+        self.name = name
+        self.opcode = opcode
+        self.arg_names = tuple(arg_names)
+        self.encoder = struct.Struct(BYTE_ORDER + 'B' + arg_format)
+        self.reply = struct.Struct(BYTE_ORDER + reply_format) if reply_format else None
+        self.expected_reply = expected_reply
+        self.size = self.encoder.size
+        self.reply_size = self.reply.size if self.reply else 0
+
+        fields = len(self.encoder.unpack(bytes(self.size))) - 1
+        if fields != len(self.arg_names):
+            raise ValueError(f"{name}: argument format '{arg_format}' has {fields} fields "
+                             f"but {len(self.arg_names)} names")
+
+        # Commands without arguments always encode to the same bytes
+        self._frame = self.encoder.pack(opcode) if not arg_format else None
+
+    def _arguments(self, args: tuple, kwargs: Dict[str, object]) -> tuple:
+        if not kwargs:
+            return args
+        values = dict(zip(self.arg_names, args))
+        for key, value in kwargs.items():
+            if key not in self.arg_names:
+                raise TypeError(f"{self.name} has no argument '{key}'")
+            if key in values:
+                raise TypeError(f"{self.name} got multiple values for argument '{key}'")
+            values[key] = value
+        missing = [key for key in self.arg_names if key not in values]
+        if missing:
+            raise TypeError(f"{self.name} is missing arguments: {', '.join(missing)}")
+        return tuple(values[key] for key in self.arg_names)
+
+    def encode(self, *args, **kwargs) -> bytes:
+        if self._frame is not None and not args and not kwargs:
+            return self._frame
+        return self.encoder.pack(self.opcode, *self._arguments(args, kwargs))
+
+    def encode_into(self, buffer: bytearray, offset: int, *args, **kwargs) -> int:
+        """Pack the command into buffer at offset and return the next free offset"""
+        self.encoder.pack_into(buffer, offset, self.opcode, *self._arguments(args, kwargs))
+        return offset + self.size
+
+    def decode_args(self, buffer: bytes, offset: int = 0) -> Dict[str, object]:
+        """Unpack the arguments of an encoded command, keyed by name"""
+        return dict(zip(self.arg_names, self.encoder.unpack_from(buffer, offset)[1:]))
+
+    def decode_reply(self, data: Optional[bytes]) -> Optional[tuple]:
+        if self.reply is None or data is None or len(data) != self.reply_size:
+            return None
+        return self.reply.unpack(data)
+
+    def is_ok(self, data: Optional[bytes]) -> bool:
+        return self.expected_reply is not None and data == self.expected_reply
+
+def _compile(table) -> Tuple[Dict[str, Command], Dict[int, Command]]:
+    by_name = {}
+    by_opcode = {}
+    for row in table:
+        command = Command(*row)
+        if command.name in by_name:
+            raise ValueError(f"Duplicate command name: {command.name}")
+        if command.opcode in by_opcode:
+            raise ValueError(f"Opcode 0x{command.opcode:02X} used by both "
+                             f"{by_opcode[command.opcode].name} and {command.name}")
+        by_name[command.name] = command
+        by_opcode[command.opcode] = command
+    return by_name, by_opcode
+
+# Compiled once at import
+COMMANDS, DISPATCH = _compile(COMMAND_TABLE)
+
+# Gate types shown in the Logic Controller mapped to the command selecting them
+GATE_COMMANDS = {
+    'AND': COMMANDS['GATE_AND'],
+    'OR': COMMANDS['GATE_OR'],
+}
+
+def encode(name: str, *args, **kwargs) -> bytes:
+    return COMMANDS[name].encode(*args, **kwargs)
+
+def decode(buffer: bytes, offset: int = 0) -> Tuple[Command, Dict[str, object], int]:
+    """Decode the command at offset using the opcode dispatch table.
+
+    Returns the command, its arguments by name and the offset just past it.
+    """
+    if offset >= len(buffer):
+        raise ValueError("No command at end of buffer")
+    command = DISPATCH.get(buffer[offset])
+    if command is None:
+        raise ValueError(f"Unknown opcode 0x{buffer[offset]:02X} at offset {offset}")
+    if offset + command.size > len(buffer):
+        raise ValueError(f"Truncated {command.name} command at offset {offset}")
+    return command, command.decode_args(buffer, offset), offset + command.size
+
+def encode_batch(commands: Iterable[Union[str, tuple]]) -> bytes:
+    """Encode many commands into one contiguous buffer for a single write.
+
+    Each item is either a command name, a (name, args) pair or a
+    (name, args, kwargs) triple.
+    """
+    resolved = []
+    total = 0
+    for item in commands:
+        if isinstance(item, str):
+            name, args, kwargs = item, (), {}
+        elif len(item) == 2:
+            (name, args), kwargs = item, {}
+        else:
+            name, args, kwargs = item
+        command = COMMANDS[name]
+        resolved.append((command, args, kwargs))
+        total += command.size
+
+    buffer = bytearray(total)
+    offset = 0
+    for command, args, kwargs in resolved:
+        offset = command.encode_into(buffer, offset, *args, **kwargs)
+    return bytes(buffer)
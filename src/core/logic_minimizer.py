@@ -0,0 +1,439 @@
+import itertools
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+# Exact Quine-McCluskey is used up to this many inputs, an Espresso-style
+# expand/irredundant heuristic above it
+QM_MAX_VARIABLES = 8
+MAX_VARIABLES = 16
+
+# Gate types we have artwork for in src/images
+GATE_AND = 'AND'
+GATE_OR = 'OR'
+GATE_INVERTER = 'INVERTER'
+
+# An implicant is (value, mask): bits set in mask are eliminated variables,
+# the remaining bits of value give the literal polarity
+Implicant = Tuple[int, int]
+
+_TOKEN_RE = re.compile(r"\s*(?:([A-Za-z_][A-Za-z0-9_]*)|([01])|(.))")
+_KEYWORDS = {'AND': '&', 'OR': '|', 'XOR': '^', 'NOT': '~'}
+# Free-form input made only of these characters is a truth table column
+_TRUTH_TABLE_RE = re.compile(r"[01xX\-\s]*[01][01xX\-\s]*")
+_IDENTIFIER_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+
+class TruthTable:
+    """Output column of a Boolean function over the given variables.
+
+    Row r assigns bit (n - 1 - i) of r to variables[i], so the first
+    variable is the most significant one.
+    """
+
+    def __init__(self, variables: Sequence[str], on_mask: int, dc_mask: int = 0):
+        if len(variables) > MAX_VARIABLES:
+            raise ValueError(f"At most {MAX_VARIABLES} variables are supported")
+        self.variables = tuple(variables)
+        self.rows = 1 << len(self.variables)
+        full = (1 << self.rows) - 1
+        self.dc_mask = dc_mask & full
+        self.on_mask = on_mask & full & ~self.dc_mask
+
+    def minterms(self) -> List[int]:
+        return _bits(self.on_mask)
+
+    def dont_cares(self) -> List[int]:
+        return _bits(self.dc_mask)
+
+    def key(self) -> Tuple[int, int, int]:
+        """Canonical key, independent of variable names"""
+        return len(self.variables), self.on_mask, self.dc_mask
+
+class MinimizedExpression:
+    def __init__(self, variables: Tuple[str, ...], implicants: Sequence[Implicant], method: str):
+        self.variables = variables
+        self.implicants = list(implicants)
+        self.method = method
+
+    def _literals(self, implicant: Implicant) -> List[Tuple[str, bool]]:
+        value, mask = implicant
+        n = len(self.variables)
+        literals = []
+        for i, name in enumerate(self.variables):
+            bit = 1 << (n - 1 - i)
+            if not mask & bit:
+                literals.append((name, bool(value & bit)))
+        return literals
+
+    def to_expression(self) -> str:
+        if not self.implicants:
+            return '0'
+        products = []
+        for implicant in self.implicants:
+            literals = self._literals(implicant)
+            if not literals:
+                return '1'
+            products.append(' & '.join(name if positive else f'~{name}'
+                                       for name, positive in literals))
+        if len(products) == 1:
+            return products[0]
+        return ' | '.join(f'({p})' if ' & ' in p else p for p in products)
+
+    def to_gates(self) -> List[Dict[str, object]]:
+        """Sum-of-products netlist using only AND, OR and INVERTER gates.
+
+        Each gate is a dict with 'type', 'inputs' and 'output'. The last
+        gate drives the function output; a constant function has no gates.
+        """
+        gates = []
+        inverted = {}
+        products = []
+        for implicant in self.implicants:
+            literals = self._literals(implicant)
+            if not literals:
+                return []
+            inputs = []
+            for name, positive in literals:
+                if not positive and name not in inverted:
+                    inverted[name] = f'~{name}'
+                    gates.append({'type': GATE_INVERTER, 'inputs': [name], 'output': inverted[name]})
+                inputs.append(name if positive else inverted[name])
+            if len(inputs) == 1:
+                products.append(inputs[0])
+            else:
+                output = f'p{len(products)}'
+                gates.append({'type': GATE_AND, 'inputs': inputs, 'output': output})
+                products.append(output)
+        if len(products) > 1:
+            gates.append({'type': GATE_OR, 'inputs': products, 'output': 'out'})
+        return gates
+
+    @property
+    def gate_count(self) -> int:
+        return len(self.to_gates())
+
+def _bits(mask: int) -> List[int]:
+    result = []
+    index = 0
+    while mask:
+        if mask & 1:
+            result.append(index)
+        mask >>= 1
+        index += 1
+    return result
+
+def _covers(implicant: Implicant, minterm: int) -> bool:
+    value, mask = implicant
+    return minterm & ~mask == value
+
+def _literal_count(implicant: Implicant, n: int) -> int:
+    return n - bin(implicant[1]).count('1')
+
+def parse_expression(text: str, variables: Optional[Sequence[str]] = None,
+                     max_variables: int = MAX_VARIABLES) -> TruthTable:
+    """Parse a formula such as "A & ~B | C" into its truth table.
+
+    Accepts &, *, AND for conjunction, |, +, OR for disjunction, ^, XOR,
+    ~, !, NOT and a trailing ' for negation, parentheses and the constants
+    0 and 1. Variables are ordered alphabetically unless given. Every
+    problem with the input, including nesting too deep to parse, is
+    reported as ValueError.
+    """
+    tokens = []
+    for name, const, op in _TOKEN_RE.findall(text):
+        if name:
+            tokens.append(_KEYWORDS.get(name.upper(), name))
+        elif const:
+            tokens.append(const)
+        elif op.strip():
+            tokens.append({'*': '&', '+': '|', '!': '~'}.get(op, op))
+    if not tokens:
+        raise ValueError("Empty expression")
+    for first, second in zip(tokens, tokens[1:]):
+        if first in ('0', '1') and second in ('0', '1'):
+            raise ValueError(f"Constants {first} and {second} need an operator between them: {text!r}")
+
+    names = sorted({t for t in tokens if t[0].isalpha() or t[0] == '_'})
+    if variables is None:
+        variables = names
+    else:
+        missing = set(names) - set(variables)
+        if missing:
+            raise ValueError(f"Unknown variables: {', '.join(sorted(missing))}")
+    n = len(variables)
+    if n > min(max_variables, MAX_VARIABLES):
+        raise ValueError(f"At most {min(max_variables, MAX_VARIABLES)} variables are supported")
+
+    # Evaluate whole truth table columns at once as bit masks
+    rows = 1 << n
+    full = (1 << rows) - 1
+    columns = {}
+    for i, name in enumerate(variables):
+        bit = 1 << (n - 1 - i)
+        columns[name] = sum(1 << r for r in range(rows) if r & bit)
+
+    position = 0
+
+    def peek():
+        return tokens[position] if position < len(tokens) else None
+
+    def take(expected=None):
+        nonlocal position
+        token = peek()
+        if token is None or (expected is not None and token != expected):
+            raise ValueError(f"Expected {expected or 'operand'} in expression: {text!r}")
+        position += 1
+        return token
+
+    def parse_or():
+        value = parse_xor()
+        while peek() == '|':
+            take()
+            value |= parse_xor()
+        return value
+
+    def parse_xor():
+        value = parse_and()
+        while peek() == '^':
+            take()
+            value ^= parse_and()
+        return value
+
+    def parse_and():
+        value = parse_not()
+        # Juxtaposition such as "A B" or "A(B|C)" is also conjunction
+        while peek() == '&' or (peek() is not None and peek() not in ('|', '^', ')', "'")):
+            if peek() == '&':
+                take()
+            value &= parse_not()
+        return value
+
+    def parse_not():
+        if peek() == '~':
+            take()
+            value = ~parse_not() & full
+        else:
+            value = parse_atom()
+        while peek() == "'":
+            take()
+            value = ~value & full
+        return value
+
+    def parse_atom():
+        token = take()
+        if token == '(':
+            value = parse_or()
+            take(')')
+            return value
+        if token == '0':
+            return 0
+        if token == '1':
+            return full
+        if token in columns:
+            return columns[token]
+        raise ValueError(f"Unexpected {token!r} in expression: {text!r}")
+
+    try:
+        on_mask = parse_or()
+    except RecursionError:
+        raise ValueError("Expression is nested too deeply") from None
+    if position != len(tokens):
+        raise ValueError(f"Unexpected {tokens[position]!r} in expression: {text!r}")
+    return TruthTable(variables, on_mask)
+
+def parse_truth_table(outputs: Union[str, Sequence], variables: Optional[Sequence[str]] = None,
+                      max_variables: int = MAX_VARIABLES) -> TruthTable:
+    """Build a truth table from its output column.
+
+    outputs holds one entry per row: 0/1, or 'x'/'-' for don't care. A
+    string such as "0001" or "01x1" is accepted as well.
+    """
+    if isinstance(outputs, str):
+        outputs = [c for c in outputs if not c.isspace()]
+    rows = len(outputs)
+    n = rows.bit_length() - 1
+    if rows == 0 or rows != 1 << n:
+        raise ValueError(f"Truth table needs a power of two rows, got {rows}")
+    if n > min(max_variables, MAX_VARIABLES):
+        raise ValueError(f"At most {min(max_variables, MAX_VARIABLES)} variables are supported")
+    if variables is None:
+        variables = [chr(ord('A') + i) for i in range(n)] if n <= 26 else [f'x{i}' for i in range(n)]
+    elif len(variables) != n:
+        raise ValueError(f"{rows} rows need {n} variables, got {len(variables)}")
+
+    on_mask = 0
+    dc_mask = 0
+    for row, output in enumerate(outputs):
+        if output in (1, True, '1'):
+            on_mask |= 1 << row
+        elif output in ('x', 'X', '-', None):
+            dc_mask |= 1 << row
+        elif output not in (0, False, '0'):
+            raise ValueError(f"Invalid truth table entry {output!r} in row {row}")
+    return TruthTable(variables, on_mask, dc_mask)
+
+def _prime_implicants(terms: Sequence[int], n: int) -> List[Implicant]:
+    current = {(t, 0) for t in terms}
+    primes = set()
+    while current:
+        merged = set()
+        used = set()
+        for value, mask in current:
+            for i in range(n):
+                bit = 1 << i
+                if mask & bit or value & bit:
+                    continue
+                partner = (value | bit, mask)
+                if partner in current:
+                    merged.add((value, mask | bit))
+                    used.add((value, mask))
+                    used.add(partner)
+        primes |= current - used
+        current = merged
+    return sorted(primes)
+
+def _select_cover(primes: List[Implicant], minterms: Sequence[int], n: int) -> List[Implicant]:
+    remaining = set(minterms)
+    cover = []
+
+    # Essential prime implicants are the only cover of some minterm
+    for m in minterms:
+        covering = [p for p in primes if _covers(p, m)]
+        if len(covering) == 1 and covering[0] not in cover:
+            cover.append(covering[0])
+    for p in cover:
+        remaining -= {m for m in remaining if _covers(p, m)}
+    if not remaining:
+        return cover
+
+    candidates = [p for p in primes if p not in cover and any(_covers(p, m) for m in remaining)]
+
+    # Small cyclic cores get an exact search, larger ones a greedy cover
+    if len(candidates) <= 16:
+        for size in range(1, len(candidates) + 1):
+            best = None
+            for combo in itertools.combinations(candidates, size):
+                if all(any(_covers(p, m) for p in combo) for m in remaining):
+                    cost = sum(_literal_count(p, n) for p in combo)
+                    if best is None or cost < best[0]:
+                        best = (cost, combo)
+            if best:
+                return cover + list(best[1])
+
+    while remaining:
+        best = max(candidates, key=lambda p: (sum(_covers(p, m) for m in remaining),
+                                               -_literal_count(p, n)))
+        cover.append(best)
+        remaining -= {m for m in remaining if _covers(best, m)}
+    return cover
+
+def _quine_mccluskey(n: int, on_mask: int, dc_mask: int) -> List[Implicant]:
+    minterms = _bits(on_mask)
+    primes = _prime_implicants(minterms + _bits(dc_mask), n)
+    return _select_cover(primes, minterms, n)
+
+def _espresso(n: int, on_mask: int, dc_mask: int) -> List[Implicant]:
+    minterms = _bits(on_mask)
+    full = (1 << (1 << n)) - 1
+    off_set = _bits(full & ~(on_mask | dc_mask))
+    allowed = on_mask | dc_mask
+
+    def valid(cube: Implicant) -> bool:
+        value, mask = cube
+        free = _bits(mask)
+        # Check whichever is smaller: the cube's own minterms or the off-set
+        if (1 << len(free)) <= len(off_set):
+            for combo in range(1 << len(free)):
+                m = value
+                for j, b in enumerate(free):
+                    if combo >> j & 1:
+                        m |= 1 << b
+                if not allowed >> m & 1:
+                    return False
+            return True
+        return not any(_covers(cube, off) for off in off_set)
+
+    def expand(cubes: List[Implicant]) -> List[Implicant]:
+        result = []
+        # Expand the largest cubes first so they swallow the small ones
+        for value, mask in sorted(cubes, key=lambda c: -bin(c[1]).count('1')):
+            if any(_covers(c, value) and mask & ~c[1] == 0 for c in result):
+                continue
+            for i in range(n):
+                bit = 1 << i
+                if not mask & bit and valid((value & ~bit, mask | bit)):
+                    value &= ~bit
+                    mask |= bit
+            result.append((value, mask))
+        return result
+
+    def irredundant(cubes: List[Implicant]) -> List[Implicant]:
+        coverage = {m: 0 for m in minterms}
+        covered = []
+        for cube in cubes:
+            ms = [m for m in minterms if _covers(cube, m)]
+            covered.append(ms)
+            for m in ms:
+                coverage[m] += 1
+        keep = []
+        # Try dropping the smallest cubes first
+        order = sorted(range(len(cubes)), key=lambda k: len(covered[k]))
+        dropped = set()
+        for k in order:
+            if all(coverage[m] > 1 for m in covered[k]):
+                for m in covered[k]:
+                    coverage[m] -= 1
+                dropped.add(k)
+        for k, cube in enumerate(cubes):
+            if k not in dropped:
+                keep.append(cube)
+        return keep
+
+    def cost(cubes: List[Implicant]) -> Tuple[int, int]:
+        return len(cubes), sum(_literal_count(c, n) for c in cubes)
+
+    cubes = irredundant(expand([(m, 0) for m in minterms]))
+    while True:
+        candidate = irredundant(expand(cubes))
+        if cost(candidate) >= cost(cubes):
+            return sorted(cubes)
+        cubes = candidate
+
+@lru_cache(maxsize=256)
+def _minimize_cached(n: int, on_mask: int, dc_mask: int) -> Tuple[Tuple[Implicant, ...], str]:
+    full = (1 << (1 << n)) - 1
+    if not on_mask:
+        return (), 'constant'
+    if on_mask | dc_mask == full:
+        return ((0, (1 << n) - 1),), 'constant'
+    if n <= QM_MAX_VARIABLES:
+        return tuple(_quine_mccluskey(n, on_mask, dc_mask)), 'quine-mccluskey'
+    return tuple(_espresso(n, on_mask, dc_mask)), 'espresso'
+
+def minimize(table: TruthTable) -> MinimizedExpression:
+    """Minimal sum-of-products cover of table, memoized on its canonical key"""
+    implicants, method = _minimize_cached(*table.key())
+    return MinimizedExpression(table.variables, implicants, method)
+
+def minimize_expression(text: str, max_variables: int = MAX_VARIABLES) -> MinimizedExpression:
+    return minimize(parse_expression(text, max_variables=max_variables))
+
+def is_truth_table(text: str) -> bool:
+    """True when text holds a truth table column such as "0001" or "01x1".
+
+    A lone "0" or "1" is still a constant, and a single word such as "x1"
+    is a variable name; write a leading don't care as "-" instead.
+    """
+    stripped = text.strip()
+    if len(''.join(stripped.split())) < 2 or _IDENTIFIER_RE.fullmatch(stripped):
+        return False
+    return bool(_TRUTH_TABLE_RE.fullmatch(stripped))
+
+def minimize_input(text: str, max_variables: int = MAX_VARIABLES) -> MinimizedExpression:
+    """Minimize user input that is either a formula or a truth table column"""
+    if is_truth_table(text):
+        return minimize(parse_truth_table(text, max_variables=max_variables))
+    return minimize_expression(text, max_variables)
+
+def clear_cache() -> None:
+    _minimize_cached.cache_clear()
@@ -1,20 +1,58 @@
-from typing import Optional
+from typing import Callable, Optional
 from .usb_device import USBDevice
+from .block_transfer import DEFAULT_BLOCK_SIZE, DEFAULT_WINDOW, BlockTransfer
+from .commands import COMMANDS, TARGET_CONFIGURATION
 
 class PICController:
-    CMD_TOGGLE_LED = 0xA1
-    RESPONSE_OK = b'O'
-
     def __init__(self, usb_device: USBDevice):
         self.usb_device = usb_device
+        self.last_transfer: Optional[BlockTransfer] = None
+        # Set while a bulk transfer owns the serial link; other commands are
+        # refused so they cannot interleave with the block stream
+        self.transfer_active = False
 
-    def toggle_led(self) -> bool:
-        if not self.usb_device.is_connected():
+    def send_command(self, name: str, *args, **kwargs) -> bool:
+        if self.transfer_active or not self.usb_device.is_connected():
             return False
-        success = self.usb_device.send_data(bytes([self.CMD_TOGGLE_LED]))
-        if not success:
+        return self.usb_device.send_data(COMMANDS[name].encode(*args, **kwargs))
+
+    def read_reply(self, name: str) -> Optional[bytes]:
+        command = COMMANDS[name]
+        if command.reply is None:
+            return None
+        return self.usb_device.read_data(command.reply_size)
+
+    def toggle_led(self) -> bool:
+        if not self.send_command('TOGGLE_LED'):
             return False
 
         # Try to get a response from PIC
-        response = self.usb_device.read_data()
-        return response == self.RESPONSE_OK 
\ No newline at end of file
+        response = self.read_reply('TOGGLE_LED')
+        return COMMANDS['TOGGLE_LED'].is_ok(response)
+
+    def create_bulk(self, data: bytes, target: int = TARGET_CONFIGURATION,
+                    block_size: int = DEFAULT_BLOCK_SIZE, window: int = DEFAULT_WINDOW) -> BlockTransfer:
+        self.last_transfer = BlockTransfer(self.usb_device, data, target, block_size, window)
+        return self.last_transfer
+
+    def run_bulk(self, transfer: BlockTransfer, progress: Optional[Callable[[int, int], None]] = None,
+                 resume: bool = False) -> bool:
+        self.transfer_active = True
+        try:
+            return transfer.resume(progress) if resume else transfer.run(progress)
+        finally:
+            self.transfer_active = False
+
+    def send_bulk(self, data: bytes, target: int = TARGET_CONFIGURATION,
+                  block_size: int = DEFAULT_BLOCK_SIZE, window: int = DEFAULT_WINDOW,
+                  progress: Optional[Callable[[int, int], None]] = None) -> bool:
+        return self.run_bulk(self.create_bulk(data, target, block_size, window), progress)
+
+    def resume_bulk(self, progress: Optional[Callable[[int, int], None]] = None) -> bool:
+        if self.last_transfer is None:
+            return False
+        return self.run_bulk(self.last_transfer, progress, resume=True)
+
+    def cancel_bulk(self) -> None:
+        if self.last_transfer is not None:
+            self.last_transfer.cancel()
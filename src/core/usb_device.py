@@ -58,5 +58,13 @@ class USBDevice:
         except serial.SerialException:
             return None
 
+    def clear_input(self) -> None:
+        if not self.connected or not self.serial_port:
+            return
+        try:
+            self.serial_port.reset_input_buffer()
+        except serial.SerialException:
+            pass
+
     def is_connected(self) -> bool:
         return self.connected and self.serial_port and self.serial_port.is_open 
\ No newline at end of file
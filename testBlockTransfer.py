@@ -0,0 +1,173 @@
+import random
+import struct
+
+from src.core.block_transfer import BlockTransfer, block_checksum
+from src.core.commands import TRANSFER_ACK, TRANSFER_NAK, decode
+from src.core.pic_controller import PICController
+
+SEED = 1234
+DATA = bytes(random.Random(SEED).randrange(256) for _ in range(20000))
+
+class LoopbackDevice:
+    """Plays the PIC side of the block transfer protocol in memory.
+
+    Incoming bytes are decoded through the command dispatch table. Blocks
+    can be dropped (no reply) or corrupted (NAK), a reply can be cut short,
+    and the device can stop answering after a number of blocks to simulate
+    an unplugged cable. Reads that find no reply count as timeouts.
+    """
+
+    def __init__(self, drop=(), corrupt=(), truncate=(), stop_after=None):
+        self.connected = True
+        self.incoming = bytearray()
+        self.outgoing = bytearray()
+        self.received = bytearray()
+        self.expected = 0
+        self.finished = False
+        self.drop = set(drop)
+        self.corrupt = set(corrupt)
+        self.truncate = set(truncate)
+        self.stop_after = stop_after
+        self.block_writes = []
+        self.clears = 0
+        self.timeouts = 0
+
+    def is_connected(self):
+        return self.connected
+
+    def clear_input(self):
+        self.clears += 1
+        self.outgoing.clear()
+
+    def read_data(self, size=1):
+        data = bytes(self.outgoing[:size])
+        del self.outgoing[:size]
+        if not data:
+            self.timeouts += 1
+        return data
+
+    def _reply(self, status, sequence, truncate=False):
+        reply = status + struct.pack('<H', sequence)
+        self.outgoing += reply[:1] if truncate else reply
+
+    def send_data(self, data):
+        self.incoming += data
+        offset = 0
+        while offset < len(self.incoming):
+            command, args, offset = decode(self.incoming, offset)
+            if command.name == 'TRANSFER_BEGIN':
+                self.finished = False
+                self._reply(TRANSFER_ACK, self.expected)
+            elif command.name == 'TRANSFER_END':
+                self.finished = True
+                self._reply(TRANSFER_ACK, self.expected)
+            elif command.name == 'TRANSFER_BLOCK':
+                payload = bytes(self.incoming[offset:offset + args['length']])
+                offset += args['length']
+                self._receive_block(args['sequence'], payload, args['checksum'])
+        self.incoming.clear()
+        return True
+
+    def _receive_block(self, sequence, payload, checksum):
+        self.block_writes.append(sequence)
+        if self.stop_after is not None and sequence >= self.stop_after:
+            return
+        # Faults only hit the first attempt so retransmissions succeed
+        if sequence in self.drop:
+            self.drop.discard(sequence)
+            return
+        if sequence in self.corrupt:
+            self.corrupt.discard(sequence)
+            payload = bytes([payload[0] ^ 0xFF]) + payload[1:]
+        if sequence == self.expected and block_checksum(payload) == checksum:
+            self.received += payload
+            self.expected += 1
+            self._reply(TRANSFER_ACK, self.expected, sequence in self.truncate)
+            self.truncate.discard(sequence)
+        else:
+            self._reply(TRANSFER_NAK, self.expected)
+
+def send(device, **kwargs):
+    controller = PICController(device)
+    return controller, controller.send_bulk(DATA, block_size=256, window=8, **kwargs)
+
+def test_clean_transfer():
+    device = LoopbackDevice()
+    progress = []
+    _, result = send(device, progress=lambda sent, total: progress.append(sent))
+    assert result and device.finished
+    assert bytes(device.received) == DATA
+    # Without errors every block is written exactly once
+    assert device.block_writes == list(range(79))
+    assert progress[-1] == len(DATA)
+
+def test_corrupted_blocks_are_resent():
+    device = LoopbackDevice(corrupt={3, 40, 78})
+    _, result = send(device)
+    assert result and bytes(device.received) == DATA
+    assert device.block_writes.count(3) == 2
+
+def test_dropped_block_nak_rewinds():
+    # Blocks behind the dropped one are NAKed, so no timeout is needed
+    device = LoopbackDevice(drop={10})
+    _, result = send(device)
+    assert result and bytes(device.received) == DATA
+    assert device.block_writes.count(10) == 2
+    assert device.timeouts == 0
+
+def test_dropped_last_block_times_out_and_rewinds():
+    # Nothing follows the last block, so only a timeout can recover it
+    device = LoopbackDevice(drop={78})
+    _, result = send(device)
+    assert result and device.finished
+    assert bytes(device.received) == DATA
+    assert device.block_writes.count(78) == 2
+    assert device.timeouts == 1
+
+def test_lost_final_ack_completes():
+    # The device has every block but its last ACK is cut short; the resent
+    # block is answered with NAK(block_count), which means done
+    device = LoopbackDevice(truncate={78})
+    controller, result = send(device)
+    assert result and device.finished
+    assert bytes(device.received) == DATA
+    assert controller.last_transfer.next_block == 79
+
+def test_partial_reply_resyncs():
+    device = LoopbackDevice(truncate={5})
+    _, result = send(device)
+    assert result and bytes(device.received) == DATA
+    assert device.clears >= 2
+
+def test_resume_after_interruption():
+    device = LoopbackDevice(stop_after=30)
+    controller, result = send(device)
+    assert not result and not device.finished
+    assert controller.last_transfer.next_block == 30
+    assert not controller.transfer_active
+
+    device.stop_after = None
+    device.block_writes.clear()
+    assert controller.resume_bulk()
+    assert bytes(device.received) == DATA
+    # The resumed run starts from the block the device reported
+    assert min(device.block_writes) == 30
+
+def test_cancel_before_run_is_kept():
+    device = LoopbackDevice()
+    transfer = BlockTransfer(device, DATA)
+    transfer.cancel()
+    assert not transfer.run()
+    assert device.block_writes == []
+    assert transfer.resume()
+    assert bytes(device.received) == DATA
+
+def main():
+    tests = [(name, test) for name, test in globals().items() if name.startswith('test_')]
+    for name, test in tests:
+        test()
+        print(f"✅ {name}")
+    print(f"{len(tests)} tests passed.")
+
+if __name__ == '__main__':
+    main()
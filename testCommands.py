@@ -0,0 +1,112 @@
+from src.core.commands import (COMMAND_TABLE, COMMANDS, DISPATCH, Command, _compile, decode,
+                               encode, encode_batch)
+from src.core.pic_controller import PICController
+
+def expect(exception, func, *args, **kwargs):
+    try:
+        func(*args, **kwargs)
+    except exception as e:
+        return e
+    raise AssertionError(f"{func.__name__} did not raise {exception.__name__}")
+
+def test_table_compiled():
+    assert len(COMMANDS) == len(DISPATCH) == len(COMMAND_TABLE)
+    for command in COMMANDS.values():
+        assert DISPATCH[command.opcode] is command
+    assert encode('TOGGLE_LED') == bytes([0xA1])
+    assert encode('GATE_AND') == b'A'
+    assert encode('GATE_OR') == b'O'
+
+def test_positional_and_keyword_arguments():
+    positional = encode('TRANSFER_BLOCK', 7, 256, 0xBEEF)
+    assert encode('TRANSFER_BLOCK', sequence=7, length=256, checksum=0xBEEF) == positional
+    assert encode('TRANSFER_BLOCK', checksum=0xBEEF, sequence=7, length=256) == positional
+    assert encode('TRANSFER_BLOCK', 7, checksum=0xBEEF, length=256) == positional
+    # Opcode then little-endian fields
+    assert positional == bytes([0xB1, 7, 0, 0, 1, 0xEF, 0xBE])
+
+def test_argument_errors():
+    block = COMMANDS['TRANSFER_BLOCK']
+    assert 'missing' in str(expect(TypeError, block.encode, 7, length=256))
+    assert 'multiple' in str(expect(TypeError, block.encode, 7, 256, 1, sequence=7))
+    assert 'no argument' in str(expect(TypeError, block.encode, 7, 256, 1, window=8))
+
+def test_batch_round_trip():
+    buffer = encode_batch([
+        'TOGGLE_LED',
+        ('GATE_AND', ()),
+        ('TRANSFER_BLOCK', (1, 2, 3)),
+        ('TRANSFER_BEGIN', (), {'target': 1, 'total_size': 70000, 'block_size': 256,
+                                'window': 8, 'checksum': 0x1234}),
+        ('TRANSFER_BLOCK', (4,), {'length': 5, 'checksum': 6}),
+        'TRANSFER_END',
+    ])
+    assert len(buffer) == 1 + 1 + 7 + 11 + 7 + 1
+
+    decoded = []
+    offset = 0
+    while offset < len(buffer):
+        command, args, offset = decode(buffer, offset)
+        decoded.append((command.name, args))
+    assert decoded == [
+        ('TOGGLE_LED', {}),
+        ('GATE_AND', {}),
+        ('TRANSFER_BLOCK', {'sequence': 1, 'length': 2, 'checksum': 3}),
+        ('TRANSFER_BEGIN', {'target': 1, 'total_size': 70000, 'block_size': 256,
+                            'window': 8, 'checksum': 0x1234}),
+        ('TRANSFER_BLOCK', {'sequence': 4, 'length': 5, 'checksum': 6}),
+        ('TRANSFER_END', {}),
+    ]
+
+def test_decode_errors():
+    expect(ValueError, decode, b'')
+    expect(ValueError, decode, b'\x00')
+    expect(ValueError, decode, encode('TRANSFER_BLOCK', 1, 2, 3)[:-1])
+
+def test_replies():
+    toggle = COMMANDS['TOGGLE_LED']
+    assert toggle.is_ok(b'O')
+    assert not toggle.is_ok(b'X')
+    assert not toggle.is_ok(None)
+    assert toggle.decode_reply(b'O') == (b'O',)
+
+    block = COMMANDS['TRANSFER_BLOCK']
+    assert block.decode_reply(b'K\x05\x00') == (b'K', 5)
+    assert block.decode_reply(b'K\x05') is None
+    assert COMMANDS['GATE_AND'].decode_reply(b'A') is None
+
+def test_table_checked_at_compile():
+    assert 'fields' in str(expect(ValueError, Command, 'BAD', 0x01, 'H', (), None, None))
+    assert 'fields' in str(expect(ValueError, Command, 'BAD', 0x01, '', ('extra',), None, None))
+    expect(ValueError, _compile, [('ONE', 0x01, '', (), None, None), ('ONE', 0x02, '', (), None, None)])
+    expect(ValueError, _compile, [('ONE', 0x01, '', (), None, None), ('TWO', 0x01, '', (), None, None)])
+
+class RecordingDevice:
+    def __init__(self):
+        self.written = bytearray()
+
+    def is_connected(self):
+        return True
+
+    def send_data(self, data):
+        self.written += data
+        return True
+
+def test_send_command_keywords():
+    device = RecordingDevice()
+    controller = PICController(device)
+    assert controller.send_command('TRANSFER_BLOCK', 7, length=256, checksum=0xBEEF)
+    assert bytes(device.written) == encode('TRANSFER_BLOCK', 7, 256, 0xBEEF)
+
+    controller.transfer_active = True
+    assert not controller.send_command('GATE_AND')
+
+def main():
+    tests = [(name, test) for name, test in globals().items() if name.startswith('test_')]
+    for name, test in tests:
+        test()
+        print(f"✅ {name}")
+    print(f"{len(tests)} tests passed.")
+
+if __name__ == '__main__':
+    main()
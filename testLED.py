@@ -1,10 +1,11 @@
 import serial
 import time
 
+from src.core.commands import COMMANDS
+
 PORT = 'COM4'      # Change this if your port is different
 BAUDRATE = 9600
-TOGGLE_COMMAND = 0xA1
-EXPECTED_RESPONSE = b'O'
+TOGGLE_COMMAND = COMMANDS['TOGGLE_LED']
 BLINK_COUNT = 10
 DELAY_BETWEEN_BLINKS = 1  # seconds
 
@@ -26,13 +27,13 @@ def main():
         print(f"Starting {BLINK_COUNT} LED toggles...")
         for i in range(BLINK_COUNT):
             print(f"Sending toggle command {i + 1}...")
-            ser.write(bytes([TOGGLE_COMMAND]))
+            ser.write(TOGGLE_COMMAND.encode())
 
             time.sleep(0.1)  # Short delay before reading
 
             if ser.in_waiting:
-                response = ser.read()
-                if response == EXPECTED_RESPONSE:
+                response = ser.read(TOGGLE_COMMAND.reply_size)
+                if TOGGLE_COMMAND.is_ok(response):
                     print(f"✅ LED toggled (response: {response})")
                 else:
                     print(f"⚠️ Unexpected response: {response}")
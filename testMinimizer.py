@@ -0,0 +1,167 @@
+import random
+
+from src.core import logic_minimizer
+from src.core.logic_minimizer import (GATE_AND, GATE_INVERTER, GATE_OR, is_truth_table, minimize,
+                                      minimize_expression, minimize_input, parse_expression,
+                                      parse_truth_table)
+
+SEED = 1234
+
+def covers(result, row):
+    for value, mask in result.implicants:
+        if row & ~mask == value:
+            return True
+    return False
+
+def check_cover(table, result):
+    for row in range(table.rows):
+        if table.dc_mask >> row & 1:
+            continue
+        expected = bool(table.on_mask >> row & 1)
+        assert covers(result, row) == expected, f"row {row} of {table.key()}"
+
+def test_parse_operators():
+    # Rows are A B = 00, 01, 10, 11 with A the most significant bit
+    cases = {
+        "A & B": '0001',
+        "A AND B": '0001',
+        "A * B": '0001',
+        "A B": '0001',
+        "A | B": '0111',
+        "A + B": '0111',
+        "A ^ B": '0110',
+        "A XOR B": '0110',
+        "~A": '1100',
+        "!A & B": '0100',
+        "A' B": '0100',
+        "NOT (A OR B)": '1000',
+        "A | B & 0": '0011',
+        "A & B | 1": '1111',
+    }
+    for text, outputs in cases.items():
+        table = parse_expression(text, ['A', 'B'])
+        assert table.on_mask == parse_truth_table(outputs).on_mask, text
+
+def test_parse_precedence():
+    # NOT binds tighter than AND, AND tighter than XOR, XOR tighter than OR
+    assert parse_expression("A | B & C").on_mask == parse_expression("A | (B & C)").on_mask
+    assert parse_expression("A ^ B & C").on_mask == parse_expression("A ^ (B & C)").on_mask
+    assert parse_expression("A | B ^ C").on_mask == parse_expression("A | (B ^ C)").on_mask
+    assert parse_expression("~A & B").on_mask == parse_expression("(~A) & B").on_mask
+
+def test_parse_errors():
+    for text in ("", "A &", "(A | B", "A | B)", "A $ B", "(" * 400 + "A" + ")" * 400, "~" * 5000 + "A",
+                 "0001", "0 1", "A & 1 0"):
+        try:
+            parse_expression(text)
+        except ValueError:
+            continue
+        raise AssertionError(f"{text[:20]!r} should not parse")
+
+    try:
+        parse_expression(" | ".join(f"x{i}" for i in range(9)), max_variables=8)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("variable limit not enforced")
+
+def test_truth_table_input():
+    table = parse_truth_table("01x1")
+    assert table.variables == ('A', 'B')
+    assert table.minterms() == [1, 3]
+    assert table.dont_cares() == [2]
+    assert parse_truth_table([0, 1, None, True]).key() == table.key()
+
+    for outputs in ("010", "01z1"):
+        try:
+            parse_truth_table(outputs)
+        except ValueError:
+            continue
+        raise AssertionError(f"{outputs!r} should be rejected")
+
+def test_input_routing():
+    assert is_truth_table("0001")
+    assert is_truth_table("01x1")
+    assert is_truth_table("0 1 - 1")
+    assert not is_truth_table("1")
+    assert not is_truth_table("x1")
+    assert not is_truth_table("A & B")
+
+    # Truth tables typed as free text reach parse_truth_table
+    assert minimize_input("0001").to_expression() == 'A & B'
+    assert minimize_input("01x1").to_expression() == 'B'
+    assert minimize_input("A | B").to_expression() == minimize_expression("A | B").to_expression()
+    assert minimize_input("x1").variables == ('x1',)
+
+    for text in ("010", " | ".join(f"x{i}" for i in range(9)), "01" * 256):
+        try:
+            minimize_input(text, max_variables=8)
+        except ValueError:
+            continue
+        raise AssertionError(f"{text[:20]!r} should be rejected")
+
+def test_cover_matches_truth_table():
+    rng = random.Random(SEED)
+    # Quine-McCluskey up to 8 inputs, the Espresso heuristic above
+    for n in range(1, 12):
+        for _ in range(10 if n <= 8 else 2):
+            outputs = ''.join(rng.choice('0001x') for _ in range(1 << n))
+            table = parse_truth_table(outputs)
+            result = minimize(table)
+            check_cover(table, result)
+            expected = 'espresso' if n > logic_minimizer.QM_MAX_VARIABLES else 'quine-mccluskey'
+            assert result.method in (expected, 'constant')
+
+def test_expression_round_trip():
+    for text in ("A & B | A & ~B", "(A | B)(A | C)", "A ^ B ^ C", "~(A & B & C) | D"):
+        table = parse_expression(text)
+        result = minimize(table)
+        check_cover(table, result)
+        assert parse_expression(result.to_expression(), table.variables).on_mask == table.on_mask
+
+def test_minimal_results():
+    assert minimize_expression("A & B | A & ~B").to_expression() == 'A'
+    assert minimize_expression("A & ~A").to_expression() == '0'
+    assert minimize_expression("A | ~A").to_expression() == '1'
+    assert len(minimize_expression("A & B & C | A & B & ~C | A & ~B").implicants) == 1
+
+def test_gate_mapping():
+    gates = minimize_expression("A & B").to_gates()
+    assert [g['type'] for g in gates] == [GATE_AND]
+    assert gates[0]['inputs'] == ['A', 'B']
+
+    gates = minimize_expression("A | B").to_gates()
+    assert [g['type'] for g in gates] == [GATE_OR]
+
+    gates = minimize_expression("A ^ B").to_gates()
+    assert sorted(g['type'] for g in gates) == [GATE_AND, GATE_AND, GATE_INVERTER, GATE_INVERTER, GATE_OR]
+    assert gates[-1]['type'] == GATE_OR
+
+    assert minimize_expression("A").to_gates() == []
+    assert minimize_expression("1").to_gates() == []
+
+def test_memoization():
+    logic_minimizer.clear_cache()
+    first = minimize(parse_expression("A & B | C"))
+    info = logic_minimizer._minimize_cached.cache_info()
+    assert (info.hits, info.misses) == (0, 1)
+
+    # Same truth table under different names and spelling hits the cache
+    second = minimize(parse_expression("(X & Y) + Z"))
+    info = logic_minimizer._minimize_cached.cache_info()
+    assert (info.hits, info.misses) == (1, 1)
+    assert second.implicants == first.implicants
+    assert second.variables == ('X', 'Y', 'Z')
+
+    minimize(parse_expression("A & B & C"))
+    assert logic_minimizer._minimize_cached.cache_info().misses == 2
+
+def main():
+    tests = [(name, test) for name, test in globals().items() if name.startswith('test_')]
+    for name, test in tests:
+        test()
+        print(f"✅ {name}")
+    print(f"{len(tests)} tests passed.")
+
+if __name__ == '__main__':
+    main()